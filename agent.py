@@ -6,39 +6,156 @@
 
 import os
 import argparse
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import Page, sync_playwright
 
 # Import our modularized components
 from config import get_site_config
-from dom_processor import get_simplified_dom
-from ai_agent import think
-from web_actions import act
+from dom_processor import get_simplified_dom, get_dom_snapshot
+from history_manager import HistoryManager
+from ai_agent import think, get_client
+from web_actions import act, StaleTargetError, take_screenshot
+from tracing import span, tracer
+from browser_session import (
+    open_context, close_context, first_page, has_profile, navigate_to_anchor
+)
 
 # Dataset directory setup
 DATASET_DIR = "dataset"
 os.makedirs(DATASET_DIR, exist_ok=True)
 
 
+def non_negative_int(value: str) -> int:
+    """
+    argparse type for options that must be an integer >= 0.
+    """
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {number}")
+    return number
+
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for options that must be an integer >= 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def run_step(
+    page: Page,
+    goal: str,
+    history: HistoryManager,
+    site_context: str,
+    task_dir: str,
+    step: int,
+    settle_ms: int = 3000,
+    action_settle_ms: int = 2000,
+    use_element_table: bool = True,
+) -> bool:
+    """
+    Runs one Observe -> Think -> Act step and records it in `history`.
+    With use_element_table=False, act() validates the target with a browser
+    round-trip instead of the observed element table (benchmark baseline).
+
+    Returns:
+        True  -> continue the loop
+        False -> stop the loop
+    """
+
+    # Allow the UI to settle before observing
+    print("Waiting for UI to settle...")
+    with span("settle", step=step):
+        page.wait_for_timeout(settle_ms)
+
+    # 1. Observe
+    with span("observe", step=step) as s:
+        snapshot = get_dom_snapshot(page)
+        s.set(dom_bytes=len(snapshot.dom.encode("utf-8")), elements=len(snapshot.elements))
+    if not snapshot.dom:
+        print("Simplified DOM is empty. Stopping agent.")
+        return False
+    page_url = page.url
+
+    # 2. Think
+    with span("think", step=step):
+        action = think(goal, snapshot.dom, history.render(), site_context)
+
+    # 3. Act
+    target = snapshot.elements.get(action.get("id"))
+    try:
+        with span("act", step=step, action=action.get("action")):
+            continue_loop = act(
+                page, action, task_dir, step,
+                snapshot.elements if use_element_table else None,
+                settle_ms=action_settle_ms,
+            )
+    except StaleTargetError as e:
+        # The page re-rendered and the target is gone: observe
+        # and think again on the next step instead of stopping
+        print(f"Stale target, re-planning: {e}")
+        history.record_note(
+            step,
+            f"Could not {action.get('action')} "
+            f"'{target.text if target else action.get('id')}': "
+            f"it disappeared after a re-render",
+            url=page_url,
+            context=snapshot.context,
+        )
+        return True
+
+    # 4. Update history for introspection in the next step
+    history.record(
+        step,
+        action,
+        label=target.text if target else "",
+        url=page_url,
+        context=snapshot.context,
+    )
+    return continue_loop
+
+
 def run_agent_loop(
     goal: str,
     task_name: str,
     workspace_url: str,
     anchor_selector: str, 
-    config: dict
+    config: dict,
+    max_steps: int = 10,
+    history_window: int = 5,
+    trace: bool = False,
+    persistent_profile: bool = False,
 ):
     """
     Outer loop that coordinates Observe -> Think -> Act steps.
     It now uses a dynamic config object to load the correct auth file and provide site context to the think phase.
+    The history passed to think() is bounded by a HistoryManager: the last
+    `history_window` steps are kept verbatim and older ones are summarized.
+    With `trace`, timing spans are written to trace.jsonl and trace.json
+    (Chrome trace-event format) in the task folder and a profile is printed.
+    With `persistent_profile`, the browser runs on the site's persistent
+    profile directory instead of a fresh context from the auth file, so the
+    HTTP cache and service workers are reused between runs.
     """
 
-    auth_file = config["auth_file"]
-    if not os.path.exists(auth_file):
-        print(
-            # Use the dynamic auth_file variable in the error
-            f"Error: auth file '{auth_file}' not found. "
-            f"Please run the login script for this site first."
-        )
-        return
+    if persistent_profile:
+        if not has_profile(config):
+            print(
+                f"Error: persistent profile '{config['profile_dir']}' not found. "
+                f"Please run the login script for this site with --persistent-profile first."
+            )
+            return
+    else:
+        auth_file = config["auth_file"]
+        if not os.path.exists(auth_file):
+            print(
+                # Use the dynamic auth_file variable in the error
+                f"Error: auth file '{auth_file}' not found. "
+                f"Please run the login script for this site first."
+            )
+            return
 
     if not workspace_url or "[REPLACE-THIS]" in workspace_url:
         print("ERROR: a valid --url argument must be provided.")
@@ -50,58 +167,43 @@ def run_agent_loop(
         f"Starting task: '{goal}'. Screenshots will be stored in: {task_dir}"
     )
 
+    if trace:
+        tracer.enable()
+
     with sync_playwright() as p:
         # slow_mo adds a small delay to each action, which helps with debugging
-        browser = p.chromium.launch(headless=False, slow_mo=250)
-        context = browser.new_context(storage_state=auth_file)
-        page = context.new_page()
-
-        print(f"Navigating to workspace: {workspace_url}")
-        page.goto(workspace_url)
-        print("Taking screenshot *immediately* after navigation...")
-        page.screenshot(
-            path=os.path.join(task_dir, "debug_01_post_navigation.png")
+        context = open_context(
+            p, config, persistent=persistent_profile, headless=False, slow_mo=250
         )
+        page = first_page(context)
+
         try:
+            print(f"Navigating to workspace: {workspace_url}")
             print(
                 f"Waiting for dashboard to load (waiting for selector: {anchor_selector})..."
             )
-            page.wait_for_selector(anchor_selector, state="visible", timeout=10000)
-            print("Dashboard loaded. Starting agent loop.")
+            time_to_anchor_ms = navigate_to_anchor(page, workspace_url, anchor_selector)
+            # Taken after the anchor wait, so it does not skew time-to-anchor;
+            # a failed wait is captured by critical_error.png below
+            print("Taking screenshot after navigation...")
+            take_screenshot(
+                page, os.path.join(task_dir, "debug_01_post_navigation.png")
+            )
+            print(
+                f"Dashboard loaded in {time_to_anchor_ms:.0f} ms "
+                f"({'persistent profile' if persistent_profile else 'fresh context'}). "
+                f"Starting agent loop."
+            )
 
-            action_history = []
+            history = HistoryManager(goal, recent_window=history_window)
             step = 1
-            max_steps = 10
 
             while True:
                 print(f"\\n--- Step {step} ---")
 
-                # Allow the UI to settle before observing
-                print("Waiting for UI to settle...")
-                page.wait_for_timeout(3000)
-
-                # 1. Observe
-                simplified_dom = get_simplified_dom(page)
-                if not simplified_dom:
-                    print("Simplified DOM is empty. Stopping agent.")
-                    break
-
-                # 2. Think
-                site_context = config["site_context_prompt"]
-                action = think(goal, simplified_dom, action_history, site_context)
-
-                # 3. Act
-                continue_loop = act(page, action, task_dir, step)
-
-                # 4. Update history for introspection in the next step
-                if action.get("action") == "type":
-                    action_history.append(
-                        f"Step {step}: Typed '{action.get('text')}' into {action.get('id')}"
-                    )
-                elif action.get("action") == "click":
-                    action_history.append(
-                        f"Step {step}: Clicked {action.get('id')}"
-                    )
+                continue_loop = run_step(
+                    page, goal, history, config["site_context_prompt"], task_dir, step
+                )
 
                 if not continue_loop or step >= max_steps:
                     if step >= max_steps:
@@ -147,11 +249,18 @@ def run_agent_loop(
             except Exception as e_dom:
                 print(f"Could not get simplified DOM: {e_dom}")
             print("Capturing a screenshot of the critical error state...")
-            page.screenshot(path=os.path.join(task_dir, "critical_error.png"))
+            take_screenshot(page, os.path.join(task_dir, "critical_error.png"))
+
+        if trace:
+            tracer.export_jsonl(os.path.join(task_dir, "trace.jsonl"))
+            tracer.export_chrome_trace(os.path.join(task_dir, "trace.json"))
+            print("\n--- Run profile ---")
+            print(tracer.format_profile())
+            print(f"Trace written to: {os.path.join(task_dir, 'trace.json')}")
 
         print("Pausing for 5 seconds before closing the browser.")
         page.wait_for_timeout(5000)
-        browser.close()
+        close_context(context)
 
 
 if __name__ == "__main__":
@@ -193,6 +302,35 @@ if __name__ == "__main__":
         help="Folder name inside ./dataset/ for storing screenshots.",
     )
 
+    parser.add_argument(
+        "--max-steps",
+        type=positive_int,
+        default=10,
+        help="Maximum number of Observe -> Think -> Act steps before stopping.",
+    )
+
+    parser.add_argument(
+        "--history-window",
+        type=non_negative_int,
+        default=5,
+        help="Number of most recent steps kept verbatim in the prompt history; "
+             "older steps are summarized.",
+    )
+
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Record timing spans, export trace.jsonl / trace.json (Chrome "
+             "trace-event format) to the task folder and print a run profile.",
+    )
+
+    parser.add_argument(
+        "--persistent-profile",
+        action="store_true",
+        help="Run on the site's persistent browser profile (keeps the HTTP cache "
+             "and service workers between runs) instead of a fresh context.",
+    )
+
     args = parser.parse_args()
 
     # 1. Detect config from the *required* URL
@@ -223,11 +361,18 @@ if __name__ == "__main__":
     
     # --- End of New Logic ---
 
+    # Fail fast on a missing OPENAI_API_KEY, before the browser is launched
+    get_client()
+
     # Pass the entire config object and the resolved anchor_selector
     run_agent_loop(
         goal=args.goal,
         task_name=args.task_name,
         workspace_url=args.url,
         anchor_selector=args.selector, 
-        config=config 
+        config=config,
+        max_steps=args.max_steps,
+        history_window=args.history_window,
+        trace=args.trace,
+        persistent_profile=args.persistent_profile,
     )
@@ -8,15 +8,29 @@ import os
 import json
 from openai import OpenAI
 
+from tracing import span
 
-# Initialize the OpenAI client
-try:
-    # OpenAI client uses the environment variable OPENAI_API_KEY
-    client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-except KeyError:
-    print("ERROR: OPENAI_API_KEY environment variable is not set.")
-    print("Environment example on Windows:  set OPENAI_API_KEY=sk-...")
-    raise SystemExit(1)
+
+# The OpenAI client is created on first use, so this module can be imported
+# (e.g. by the benchmarks) without an API key. OPENAI_BASE_URL, if set,
+# points it at another chat-completions server such as the benchmark mock.
+client = None
+
+
+def get_client() -> OpenAI:
+    """
+    Returns the shared OpenAI client, creating it on first call.
+    """
+    global client
+    if client is None:
+        try:
+            # OpenAI client uses the environment variable OPENAI_API_KEY
+            client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+        except KeyError:
+            print("ERROR: OPENAI_API_KEY environment variable is not set.")
+            print("Environment example on Windows:  set OPENAI_API_KEY=sk-...")
+            raise SystemExit(1)
+    return client
 
 
 def think(goal: str, dom: str, history: list, site_context: str) -> dict:
@@ -91,11 +105,17 @@ def think(goal: str, dom: str, history: list, site_context: str) -> dict:
 
     print("Agent is thinking...")
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-        )
+        with span("llm", model="gpt-4o", prompt_chars=len(prompt)) as s:
+            response = get_client().chat.completions.create(
+                model="gpt-4o",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0,
+            )
+            if response.usage is not None:
+                s.set(
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=response.usage.completion_tokens,
+                )
 
         response_text = response.choices[0].message.content
 
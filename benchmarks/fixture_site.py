@@ -0,0 +1,260 @@
+# benchmarks/fixture_site.py
+"""
+Local fixture site for offline benchmarks
+Serves a Linear-like single-page app that reproduces the patterns
+get_simplified_dom() targets: a long issue list, a modal dialog with
+text inputs, a popover [role="menu"] and a confirmation dialog
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# Fixture sizes: number of issue rows in the list
+FIXTURE_SIZES = {
+    "small": 50,
+    "medium": 500,
+    "large": 5000,
+}
+
+# Selector to wait for before the agent loop starts (same as Linear's config)
+ANCHOR_SELECTOR = 'text="Inbox"'
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Fixture - {rows} issues</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0; display: flex; }}
+  nav {{ width: 180px; padding: 12px; border-right: 1px solid #ddd; }}
+  main {{ flex: 1; padding: 12px; }}
+  li {{ padding: 2px 0; }}
+  [role="dialog"] {{ position: fixed; top: 20%; left: 30%; background: #fff;
+                     border: 1px solid #888; padding: 16px; }}
+  [role="menu"] {{ position: absolute; top: 48px; left: 320px; background: #fff;
+                   border: 1px solid #888; }}
+  [role="menuitem"] {{ padding: 4px 12px; cursor: pointer; }}
+</style>
+</head>
+<body>
+<div id="app"></div>
+<script>window.FIXTURE = {{ rows: {rows}, churnMs: {churn} }};</script>
+<script src="/static/app-{bundle_kb}.js"></script>
+</body>
+</html>
+"""
+
+APP_SCRIPT = """
+(() => {
+    const state = { issues: [], overlay: null, nextId: 1 };
+    for (let i = 0; i < window.FIXTURE.rows; i++) {
+        state.issues.push({ id: state.nextId++, title: 'Existing issue ' + (i + 1) });
+    }
+
+    const app = document.getElementById('app');
+    app.outerHTML =
+        '<nav><a href="#">Inbox</a><br><a href="#">My issues</a><br>' +
+        '<a href="#">Projects</a></nav>' +
+        '<main><div id="toolbar"></div><ul id="list"></ul></main>' +
+        '<div id="overlay"></div>';
+
+    function renderToolbar() {
+        document.getElementById('toolbar').innerHTML =
+            '<button data-action="new-issue">New issue</button> ' +
+            '<button data-action="options">Issue options</button>';
+    }
+
+    function renderList() {
+        document.getElementById('list').innerHTML = state.issues.map(issue =>
+            '<li><input type="checkbox" id="cb-' + issue.id + '">' +
+            '<label for="cb-' + issue.id + '">Select</label> ' +
+            '<a href="#">ENG-' + issue.id + ' ' + issue.title + '</a></li>'
+        ).join('');
+    }
+
+    function renderOverlay() {
+        const overlay = document.getElementById('overlay');
+        // Keep typed values across re-renders, like a controlled React form
+        const values = {};
+        overlay.querySelectorAll('input, textarea').forEach(el => {
+            values[el.getAttribute('name')] = el.value;
+        });
+
+        if (state.overlay === 'new-issue') {
+            overlay.innerHTML =
+                '<div role="dialog" aria-modal="true" aria-label="New issue">' +
+                '<h2>New issue</h2>' +
+                '<input name="title" placeholder="Issue title"><br>' +
+                '<textarea name="description" placeholder="Add description..."></textarea><br>' +
+                '<button data-action="close">Cancel</button> ' +
+                '<button data-action="create">Create issue</button></div>';
+        } else if (state.overlay === 'menu') {
+            overlay.innerHTML =
+                '<div role="menu" aria-label="Issue options">' +
+                '<div role="menuitem" data-action="close">Duplicate</div>' +
+                '<div role="menuitem" data-action="delete">Delete</div></div>';
+        } else if (state.overlay === 'confirm-delete') {
+            overlay.innerHTML =
+                '<div role="dialog" aria-modal="true" aria-label="Delete issue">' +
+                '<h2>Delete issue?</h2>' +
+                '<button data-action="close">Cancel</button> ' +
+                '<button data-action="confirm-delete">Delete</button></div>';
+        } else {
+            overlay.innerHTML = '';
+        }
+
+        overlay.querySelectorAll('input, textarea').forEach(el => {
+            el.value = values[el.getAttribute('name')] || '';
+        });
+    }
+
+    document.addEventListener('click', event => {
+        const target = event.target.closest('[data-action]');
+        if (!target) return;
+        const action = target.getAttribute('data-action');
+
+        if (action === 'new-issue') {
+            state.overlay = 'new-issue';
+        } else if (action === 'options') {
+            state.overlay = 'menu';
+        } else if (action === 'delete') {
+            state.overlay = 'confirm-delete';
+        } else if (action === 'create') {
+            const title = document.querySelector('[name="title"]').value || 'Untitled';
+            state.issues.unshift({ id: state.nextId++, title: title });
+            state.overlay = null;
+            renderList();
+        } else if (action === 'confirm-delete') {
+            state.issues.shift();
+            state.overlay = null;
+            renderList();
+        } else if (action === 'close') {
+            state.overlay = null;
+        }
+        renderOverlay();
+    });
+
+    renderToolbar();
+    renderList();
+    renderOverlay();
+
+    // Optional churn: periodically re-render the toolbar and overlay,
+    // which drops every data-agent-id on them (stale-target scenario)
+    if (window.FIXTURE.churnMs > 0) {
+        setInterval(() => { renderToolbar(); renderOverlay(); }, window.FIXTURE.churnMs);
+    }
+})();
+"""
+
+
+def render_page(rows: int, churn_ms: int = 0, bundle_kb: int = 0) -> str:
+    """
+    Returns the fixture HTML for a list of `rows` issues.
+    """
+    return PAGE_TEMPLATE.format(rows=rows, churn=churn_ms, bundle_kb=bundle_kb)
+
+
+def render_bundle(bundle_kb: int) -> str:
+    """
+    Returns the app script padded to roughly `bundle_kb` KB, standing in
+    for the large JS bundles of the real sites.
+    """
+    line = "/* " + "x" * 1017 + " */\n"
+    return APP_SCRIPT + line * bundle_kb
+
+
+class FixtureSite:
+    """
+    Serves the fixture app on a local port in a background thread.
+
+    Pages: /?rows=N&churn=MS&bundle_kb=K (or /?size=small|medium|large)
+    Assets: /static/app-<K>.js, cacheable for a day. `asset_delay_ms`
+    delays every asset download (not 304 revalidations) to simulate a slow
+    network; `asset_requests` counts the downloads.
+    """
+
+    def __init__(self, port: int = 0, asset_delay_ms: int = 0):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.asset_delay_ms = asset_delay_ms
+        self.asset_requests = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page_url(self, size: str = "medium", churn_ms: int = 0, bundle_kb: int = 0) -> str:
+        rows = FIXTURE_SIZES[size]
+        return f"{self.url}/?rows={rows}&churn={churn_ms}&bundle_kb={bundle_kb}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        parsed = urlparse(request.path)
+        if parsed.path.startswith("/static/app-") and parsed.path.endswith(".js"):
+            etag = '"' + parsed.path + '"'
+            if request.headers.get("If-None-Match") == etag:
+                request.send_response(304)
+                request.end_headers()
+                return
+            self.asset_requests += 1
+            if self.asset_delay_ms:
+                threading.Event().wait(self.asset_delay_ms / 1000)
+            bundle_kb = int(parsed.path[len("/static/app-"):-len(".js")] or 0)
+            self._send(
+                request, render_bundle(bundle_kb), "application/javascript",
+                {"Cache-Control": "public, max-age=86400", "ETag": etag},
+            )
+            return
+
+        if parsed.path == "/":
+            query = parse_qs(parsed.query)
+            size = query.get("size", [None])[0]
+            rows = FIXTURE_SIZES[size] if size else int(query.get("rows", ["500"])[0])
+            html = render_page(
+                rows,
+                churn_ms=int(query.get("churn", ["0"])[0]),
+                bundle_kb=int(query.get("bundle_kb", ["0"])[0]),
+            )
+            self._send(request, html, "text/html", {"Cache-Control": "no-cache"})
+            return
+
+        request.send_response(404)
+        request.end_headers()
+
+    @staticmethod
+    def _send(request, body: str, content_type: str, headers: dict):
+        data = body.encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", content_type + "; charset=utf-8")
+        request.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            request.send_header(key, value)
+        request.end_headers()
+        request.wfile.write(data)
@@ -0,0 +1,214 @@
+# benchmarks/mock_llm.py
+"""
+Mock chat-completions server for offline benchmarks
+Implements POST /v1/chat/completions with scripted, latency-injected replies,
+so ai_agent.think() can run unchanged with OPENAI_BASE_URL pointed here
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Scripted scenario for the fixture site: create an issue, then delete one.
+# `target` is the visible label of the element to act on; the server looks it
+# up in the DOM section of the prompt to find the current data-agent-id.
+# The script is cyclic, so runs of any length stay on a valid path.
+DEFAULT_SCRIPT = [
+    {"action": "click", "target": "New issue"},
+    {"action": "type", "target": "Issue title", "text": "Benchmark issue"},
+    {"action": "type", "target": "Add description...", "text": "Created by the benchmark"},
+    {"action": "click", "target": "Create issue"},
+    {"action": "click", "target": "Issue options"},
+    {"action": "click", "target": "Delete"},
+    {"action": "click", "target": "Delete"},
+]
+
+# Matches one line of the simplified DOM inside the prompt
+DOM_LINE = re.compile(
+    r'data-agent-id="(?P<id>[^"]+)"(?: label="(?P<label>[^"]*)")?>(?P<text>[^<\n]*)<'
+)
+
+
+def find_agent_id(prompt: str, target: str):
+    """
+    Returns the data-agent-id of the first element in the prompt's DOM whose
+    label or text equals `target`, or None.
+    """
+    for match in DOM_LINE.finditer(prompt):
+        label = (match.group("label") or match.group("text") or "").strip()
+        if label == target:
+            return match.group("id")
+    return None
+
+
+class MockLLMServer:
+    """
+    Serves scripted chat-completion replies on a local port in a
+    background thread.
+
+    Each request returns the next scripted action, with its target resolved
+    against the DOM in the prompt. The script only advances when the target
+    is found; otherwise a "fail" action is returned. Replies are delayed by
+    `latency_ms` plus uniform jitter of up to `jitter_ms`.
+    """
+
+    def __init__(
+        self,
+        script: list = None,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        port: int = 0,
+        seed: int = 0,
+    ):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.script = script or DEFAULT_SCRIPT
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.cursor = 0
+        self.requests = 0
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def reset(self):
+        with self.lock:
+            self.cursor = 0
+            self.requests = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def next_action(self, prompt: str) -> dict:
+        """
+        Resolves the next scripted step against the prompt.
+        """
+        with self.lock:
+            self.requests += 1
+            entry = self.script[self.cursor % len(self.script)]
+            if entry["action"] not in ("click", "type"):
+                self.cursor += 1
+                return dict(entry)
+
+            agent_id = find_agent_id(prompt, entry["target"])
+            if agent_id is None:
+                return {
+                    "action": "fail",
+                    "reason": f"'{entry['target']}' is not in the current DOM",
+                }
+
+            self.cursor += 1
+            action = {"action": entry["action"], "id": agent_id}
+            if entry["action"] == "type":
+                action["text"] = entry["text"]
+            return action
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        if not request.path.rstrip("/").endswith("/chat/completions"):
+            request.send_response(404)
+            request.end_headers()
+            return
+
+        length = int(request.headers.get("Content-Length", 0))
+        body = json.loads(request.rfile.read(length) or b"{}")
+        prompt = "\n".join(
+            m.get("content", "") for m in body.get("messages", [])
+            if isinstance(m.get("content"), str)
+        )
+
+        action = self.next_action(prompt)
+        content = json.dumps(action)
+
+        delay_ms = self.latency_ms
+        if self.jitter_ms:
+            with self.lock:
+                delay_ms += self.random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+        reply = {
+            "id": f"chatcmpl-mock-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            # Rough token estimate (~4 characters per token)
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+            },
+        }
+
+        data = json.dumps(reply).encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+
+if __name__ == "__main__":
+    """
+    Runs the mock server standalone, e.g. to point agent.py at it with
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock
+    """
+
+    parser = argparse.ArgumentParser(description="Mock chat-completions server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument(
+        "--script",
+        type=str,
+        default=None,
+        help="JSON file with a list of scripted steps (defaults to the fixture scenario).",
+    )
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+
+    mock = MockLLMServer(script, args.latency_ms, args.jitter_ms, port=args.port)
+    print(f"Mock LLM server listening on {mock.base_url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,250 @@
+# benchmarks/run_benchmark.py
+"""
+Offline benchmark harness
+Runs the real Observe -> Think -> Act step (agent.run_step) against the
+local fixture site and the mock chat-completions server, and reports
+steps per second, per-phase latency and memory for each fixture size.
+With --validation both, every fixture also runs with act() validating the
+target through a browser round-trip instead of the element table, so the
+per-action latency with and without the table is reported side by side.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmark --sizes small medium --steps 21
+    python -m benchmarks.run_benchmark --compare benchmarks/results/OLD.json
+    python -m benchmarks.run_benchmark --validation both
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from playwright.sync_api import sync_playwright
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.fixture_site import ANCHOR_SELECTOR, FIXTURE_SIZES, FixtureSite
+from benchmarks.mock_llm import MockLLMServer
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+GOAL = (
+    "First, click 'New issue'. Second, type 'Benchmark issue' into 'Issue title'. "
+    "Third, type 'Created by the benchmark' into 'Add description...'. "
+    "Fourth, click 'Create issue'. Fifth, click 'Issue options'. "
+    "Sixth, click 'Delete'. Seventh, click 'Delete' in the confirmation dialog."
+)
+SITE_CONTEXT = "We are on a local benchmark fixture that mimics Linear."
+
+# How act() validates its target: against the observed element table, or
+# with a locator round-trip per action (the behavior before the table)
+VALIDATION_MODES = ("table", "round-trip")
+
+
+def git_commit() -> str:
+    """
+    Returns the short hash of HEAD, or "unknown" outside a git checkout.
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def peak_rss_kb():
+    """
+    Peak resident set size of this process so far (KB on Linux), or None.
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_fixture(browser, site, mock, size: str, validation: str, args) -> dict:
+    """
+    Runs `args.steps` agent steps on one fixture size with the given
+    validation mode and returns its results.
+    Screenshots go to a temporary directory that is removed afterwards.
+    """
+    # Imported here so OPENAI_BASE_URL / OPENAI_API_KEY are set first
+    from agent import run_step
+    from history_manager import HistoryManager
+    from tracing import tracer
+
+    mock.reset()
+    context = browser.new_context()
+    page = context.new_page()
+    rss_before = peak_rss_kb()
+
+    tracer.enable()
+    page.goto(site.page_url(size, churn_ms=args.churn_ms))
+    page.wait_for_selector(ANCHOR_SELECTOR, state="visible", timeout=10000)
+
+    history = HistoryManager(GOAL, recent_window=args.history_window)
+    completed = 0
+    with tempfile.TemporaryDirectory(prefix=f"bench_{size}_") as task_dir:
+        started = time.perf_counter()
+        for step in range(1, args.steps + 1):
+            if not run_step(
+                page, GOAL, history, SITE_CONTEXT, task_dir, step,
+                settle_ms=args.settle_ms, action_settle_ms=args.settle_ms,
+                use_element_table=validation == "table",
+            ):
+                break
+            completed += 1
+        elapsed = time.perf_counter() - started
+    tracer.disable()
+    rss_after = peak_rss_kb()
+
+    js_heap = page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : null")
+    context.close()
+
+    return {
+        "fixture": size,
+        "validation": validation,
+        "rows": FIXTURE_SIZES[size],
+        "steps": completed,
+        "elapsed_s": elapsed,
+        "steps_per_sec": completed / elapsed if elapsed > 0 else 0.0,
+        "llm_requests": mock.requests,
+        "phases": tracer.profile(),
+        "memory": {
+            # High-water mark of the whole benchmark process so far
+            "process_peak_rss_kb": rss_after,
+            # How much that high-water mark rose while this fixture ran
+            "fixture_peak_rss_growth_kb": (
+                rss_after - rss_before if rss_after is not None else None
+            ),
+            "js_heap_bytes": js_heap,
+        },
+    }
+
+
+def print_results(results: list):
+    print(f"\n{'fixture':<10}{'validation':<12}{'rows':>7}{'steps':>7}{'steps/s':>10}"
+          f"  phase p50 ms")
+    for r in results:
+        phases = {p["name"]: p["p50_ms"] for p in r["phases"]}
+        summary = ", ".join(
+            f"{name}={phases[name]:.1f}"
+            for name in ("observe", "think", "act", "validate", "action", "screenshot")
+            if name in phases
+        )
+        print(f"{r['fixture']:<10}{r['validation']:<12}{r['rows']:>7}{r['steps']:>7}"
+              f"{r['steps_per_sec']:>10.2f}  {summary}")
+
+
+def compare(baseline_path: str, current: dict):
+    """
+    Prints per-fixture changes of steps/s and phase p50 latency
+    relative to a saved baseline run.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\nComparison: {baseline['commit']} -> {current['commit']}")
+    old_by_fixture = {
+        (r["fixture"], r.get("validation", "table")): r for r in baseline["results"]
+    }
+    for r in current["results"]:
+        old = old_by_fixture.get((r["fixture"], r["validation"]))
+        if old is None:
+            continue
+        print(f"[{r['fixture']}, {r['validation']}] steps/s: {old['steps_per_sec']:.2f} -> "
+              f"{r['steps_per_sec']:.2f} ({_change(old['steps_per_sec'], r['steps_per_sec'])})")
+        old_phases = {p["name"]: p for p in old["phases"]}
+        for p in r["phases"]:
+            o = old_phases.get(p["name"])
+            if o is None:
+                continue
+            print(f"    {p['name']:<12} p50 {o['p50_ms']:>8.1f} -> {p['p50_ms']:>8.1f} ms "
+                  f"({_change(o['p50_ms'], p['p50_ms'])})")
+
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline agent benchmark.")
+    parser.add_argument(
+        "--sizes", nargs="+", default=list(FIXTURE_SIZES),
+        choices=list(FIXTURE_SIZES), help="Fixture sizes to run.",
+    )
+    parser.add_argument("--steps", type=int, default=21,
+                        help="Agent steps per fixture (the scenario is 7 steps long).")
+    parser.add_argument("--latency-ms", type=float, default=0,
+                        help="Injected mock LLM latency per reply.")
+    parser.add_argument("--jitter-ms", type=float, default=0,
+                        help="Extra uniform random mock LLM latency per reply.")
+    parser.add_argument("--settle-ms", type=int, default=0,
+                        help="UI settle wait before observing and after acting.")
+    parser.add_argument("--churn-ms", type=int, default=0,
+                        help="Re-render toolbar and overlay every N ms (stale-target scenario).")
+    parser.add_argument("--history-window", type=int, default=5)
+    parser.add_argument("--validation", default="table",
+                        choices=VALIDATION_MODES + ("both",),
+                        help="How act() validates its target; 'both' runs each fixture "
+                             "twice to compare them.")
+    parser.add_argument("--headed", action="store_true", help="Show the browser.")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Results JSON path (default: benchmarks/results/<commit>-<time>.json).")
+    parser.add_argument("--compare", type=str, default=None,
+                        help="Baseline results JSON to compare against.")
+    args = parser.parse_args()
+
+    with FixtureSite() as site, MockLLMServer(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms
+    ) as mock:
+        os.environ["OPENAI_BASE_URL"] = mock.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+        results = []
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=not args.headed)
+            modes = VALIDATION_MODES if args.validation == "both" else (args.validation,)
+            for size in args.sizes:
+                for validation in modes:
+                    print(f"Running fixture '{size}' ({FIXTURE_SIZES[size]} rows, "
+                          f"{validation} validation)...", file=sys.stderr)
+                    results.append(run_fixture(browser, site, mock, size, validation, args))
+            browser.close()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "results": results,
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR, f"{report['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print_results(results)
+    print(f"\nResults saved to: {output}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
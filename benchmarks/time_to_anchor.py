@@ -0,0 +1,137 @@
+# benchmarks/time_to_anchor.py
+"""
+Cold versus warm time-to-anchor
+Measures how long it takes from navigation until the anchor selector is
+visible, for a fresh browser context (cold cache) and for a persistent
+profile that was already used once (warm cache).
+
+By default it runs offline against the fixture site, whose JS bundle is
+cacheable and can be made large and slow to download. With --site and
+--url it measures a real site instead: cold uses a fresh context from the
+site's auth file, warm uses the site's persistent profile.
+
+Usage (from the repository root):
+    python -m benchmarks.time_to_anchor --bundle-kb 4096 --asset-delay-ms 300
+    python -m benchmarks.time_to_anchor --site linear --url https://linear.app/...
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+
+from playwright.sync_api import sync_playwright
+
+from benchmarks.fixture_site import ANCHOR_SELECTOR, FIXTURE_SIZES, FixtureSite
+from browser_session import (
+    close_context, first_page, has_profile, navigate_to_anchor, open_context
+)
+from config import SITE_CONFIGS
+
+
+def measure(p, config: dict, persistent: bool, url: str, anchor_selector: str) -> float:
+    """
+    Launches a context, measures one time-to-anchor and closes it again,
+    so a persistent profile is flushed to disk between runs.
+    """
+    context = open_context(p, config, persistent=persistent, headless=True)
+    try:
+        page = first_page(context)
+        return navigate_to_anchor(page, url, anchor_selector, timeout=60000)
+    finally:
+        close_context(context)
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "runs": len(samples),
+        "p50_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "samples_ms": samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs warm time-to-anchor.")
+    parser.add_argument("--runs", type=int, default=5, help="Measurements per mode.")
+    parser.add_argument("--site", choices=list(SITE_CONFIGS), default=None,
+                        help="Measure a real site (requires --url and a saved login).")
+    parser.add_argument("--url", type=str, default=None, help="Workspace URL for --site.")
+    parser.add_argument("--size", default="medium", choices=list(FIXTURE_SIZES),
+                        help="Fixture size.")
+    parser.add_argument("--bundle-kb", type=int, default=4096,
+                        help="Fixture JS bundle size in KB.")
+    parser.add_argument("--asset-delay-ms", type=int, default=300,
+                        help="Simulated download delay of the fixture bundle.")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON.")
+    args = parser.parse_args()
+
+    if args.runs < 1:
+        parser.error(f"--runs must be >= 1, got {args.runs}")
+    if args.site:
+        if not args.url:
+            parser.error("--site requires --url")
+        config = SITE_CONFIGS[args.site]
+        if not os.path.exists(config["auth_file"]):
+            parser.error(
+                f"auth file '{config['auth_file']}' not found; "
+                f"run login_{args.site}.py first"
+            )
+        if not has_profile(config):
+            parser.error(
+                f"persistent profile '{config['profile_dir']}' not found; "
+                f"run login_{args.site}.py --persistent-profile first"
+            )
+
+    cold, warm = [], []
+    site = None
+    with sync_playwright() as p:
+        if args.site:
+            url, anchor = args.url, config["anchor_selector"]
+
+            for _ in range(args.runs):
+                cold.append(measure(p, config, False, url, anchor))
+            # Prime the profile once, then measure warm loads
+            measure(p, config, True, url, anchor)
+            for _ in range(args.runs):
+                warm.append(measure(p, config, True, url, anchor))
+        else:
+            site = FixtureSite(asset_delay_ms=args.asset_delay_ms).start()
+            url = site.page_url(args.size, bundle_kb=args.bundle_kb)
+
+            for _ in range(args.runs):
+                profile_dir = tempfile.mkdtemp(prefix="bench_profile_")
+                config = {"auth_file": "", "profile_dir": profile_dir}
+                cold.append(measure(p, config, True, url, ANCHOR_SELECTOR))
+                warm.append(measure(p, config, True, url, ANCHOR_SELECTOR))
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            site.stop()
+
+    report = {"url": url, "cold": summarize(cold), "warm": summarize(warm)}
+    if site is not None:
+        report["fixture"] = {
+            "size": args.size,
+            "bundle_kb": args.bundle_kb,
+            "asset_delay_ms": args.asset_delay_ms,
+            "asset_downloads": site.asset_requests,
+        }
+
+    print(f"{'mode':<6}{'runs':>6}{'p50 ms':>10}{'min ms':>10}{'max ms':>10}")
+    for mode in ("cold", "warm"):
+        r = report[mode]
+        print(f"{mode:<6}{r['runs']:>6}{r['p50_ms']:>10.0f}{r['min_ms']:>10.0f}"
+              f"{r['max_ms']:>10.0f}")
+    speedup = report["cold"]["p50_ms"] / report["warm"]["p50_ms"]
+    print(f"Warm profile is {speedup:.2f}x faster to anchor (p50).")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# browser_session.py
+"""
+Browser Session Module
+Opens the browser context for a site, either from a saved *_auth.json
+storage state (fresh context, empty cache) or from a persistent per-site
+profile that keeps the disk cache and service workers between runs
+"""
+
+import os
+import time
+
+from playwright.sync_api import BrowserContext, Page, Playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from tracing import span
+
+
+# How long a login script waits for the user to finish logging in
+LOGIN_TIMEOUT_MS = 5 * 60 * 1000
+
+
+def open_context(
+    p: Playwright,
+    config: dict,
+    persistent: bool = False,
+    headless: bool = False,
+    slow_mo: float = 0,
+) -> BrowserContext:
+    """
+    Returns a browser context for the site described by `config`.
+
+    persistent=False -> fresh context loaded from config["auth_file"]
+    persistent=True  -> persistent context on config["profile_dir"]
+    Close it with close_context().
+    """
+    if persistent:
+        os.makedirs(config["profile_dir"], exist_ok=True)
+        return p.chromium.launch_persistent_context(
+            config["profile_dir"], headless=headless, slow_mo=slow_mo
+        )
+
+    browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
+    storage_state = config["auth_file"] if os.path.exists(config["auth_file"]) else None
+    return browser.new_context(storage_state=storage_state)
+
+
+def close_context(context: BrowserContext):
+    """
+    Closes a context from open_context(), and its browser if it owns one.
+    """
+    browser = context.browser
+    context.close()
+    if browser is not None:
+        browser.close()
+
+
+def first_page(context: BrowserContext) -> Page:
+    """
+    Returns the page a persistent context opens with, or a new page.
+    """
+    return context.pages[0] if context.pages else context.new_page()
+
+
+def has_profile(config: dict) -> bool:
+    """
+    True if a persistent profile has already been created for the site.
+    """
+    profile_dir = config["profile_dir"]
+    return os.path.isdir(profile_dir) and bool(os.listdir(profile_dir))
+
+
+def navigate_to_anchor(
+    page: Page,
+    url: str,
+    anchor_selector: str,
+    timeout: float = 10000,
+) -> float:
+    """
+    Navigates to `url` and waits until `anchor_selector` is visible.
+    Returns the time-to-anchor in milliseconds.
+    """
+    started = time.perf_counter()
+    with span("navigate", url=url):
+        page.goto(url)
+    with span("wait_anchor", selector=anchor_selector):
+        page.wait_for_selector(anchor_selector, state="visible", timeout=timeout)
+    return (time.perf_counter() - started) * 1000
+
+
+def capture_login(p: Playwright, config: dict, persistent: bool = False):
+    """
+    Opens the site's login page and waits for the user to log in manually.
+    As soon as the site's anchor_selector appears, the session is saved to
+    config["auth_file"]; in persistent mode it also stays in the profile.
+    Without a persistent profile the login always starts from a fresh
+    context, ignoring any existing auth file, so it can switch accounts.
+    """
+    if persistent:
+        context = open_context(p, config, persistent=True)
+    else:
+        context = p.chromium.launch(headless=False).new_context()
+
+    try:
+        page = first_page(context)
+        page.goto(config["login_url"])
+
+        print("\n" + "=" * 50)
+        print("  Please log in manually in the browser.")
+        print("  (This may involve Google, email, etc.)")
+        print("\n  The session is saved automatically as soon as")
+        print(f"  the page shows: {config['anchor_selector']}")
+        print("=" * 50)
+
+        try:
+            page.wait_for_selector(
+                config["anchor_selector"], state="visible", timeout=LOGIN_TIMEOUT_MS
+            )
+        except PlaywrightTimeoutError:
+            print(
+                f"Error: login not detected within {LOGIN_TIMEOUT_MS // 60000} minutes "
+                f"(waiting for: {config['anchor_selector']}). Nothing was saved; "
+                f"please run the login script again."
+            )
+            return
+
+        context.storage_state(path=config["auth_file"])
+        print(f"Successfully saved auth state to: {config['auth_file']}")
+        if persistent:
+            print(f"Persistent profile stored in: {config['profile_dir']}")
+    finally:
+        close_context(context)
@@ -10,6 +10,8 @@
 SITE_CONFIGS = {
     "trello": {
         "auth_file": "trello_auth.json",
+        "profile_dir": "profiles/trello",
+        "login_url": "https://trello.com/login",
         "anchor_selector": '[data-testid="head-container"]',
         "default_goal": (
             "Find the list named 'To Do'. Click the 'Add a card' button. "
@@ -21,6 +23,8 @@ SITE_CONFIGS = {
     },
     "linear": {
         "auth_file": "linear_auth.json",
+        "profile_dir": "profiles/linear",
+        "login_url": "https://linear.app/login",
         "anchor_selector": 'text="Inbox"',
         "default_goal": (
             "Find the button to create a new issue and click it. "
@@ -32,6 +36,8 @@ SITE_CONFIGS = {
     },
     "notion": {
         "auth_file": "notion_auth.json",
+        "profile_dir": "profiles/notion",
+        "login_url": "https://www.notion.so/login",
         "anchor_selector": 'text="Home"', # Waits for the sidebar to load
         "default_goal": (
             "Execute the following commands step by step."
@@ -71,6 +77,8 @@ def get_site_config(url: str) -> dict:
     # but auth will likely fail.
     return {
         "auth_file": "default_auth.json",
+        "profile_dir": "profiles/default",
+        "login_url": url,
         "anchor_selector": "body", # A generic selector
         "default_goal": "No default goal specified.",
         "site_context_prompt": "We are on an unknown website."
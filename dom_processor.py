@@ -4,10 +4,67 @@ DOM Processing Module
 Responsible for extracting and simplifying webpage DOM structure for AI decision making
 """
 
+from dataclasses import dataclass, field
+from typing import Optional
+
 from playwright.sync_api import Page
 
 
+@dataclass(frozen=True)
+class ElementInfo:
+    """
+    One tagged interactive element, as seen at observe time.
+    `box` is the bounding client rect as (x, y, width, height).
+    `context` is the kind of container it was found in ('modal', 'menu' or
+    'page') and `position` its index among the elements tagged there;
+    together with tag and text they fingerprint the element across re-renders.
+    """
+    id: str
+    tag: str
+    text: str
+    input_type: Optional[str]
+    role: Optional[str]
+    is_text_input: bool
+    is_checkbox: bool
+    box: tuple
+    context: str = "page"
+    position: int = 0
+
+
+@dataclass
+class DomSnapshot:
+    """
+    Result of the observe step.
+    `dom` is the simplified DOM string sent to the LLM, `elements` maps each
+    data-agent-id to its ElementInfo, and `context` describes the modal,
+    menu or page the elements were taken from.
+    """
+    dom: str = ""
+    elements: dict = field(default_factory=dict)
+    context: str = ""
+
+
+def format_element(el: ElementInfo) -> str:
+    """
+    Formats one element in the simplified DOM syntax the LLM prompt expects.
+    """
+    label = el.text or ''
+    if el.is_text_input:
+        return f'<TEXT-INPUT data-agent-id="{el.id}" label="{label}"></TEXT-INPUT>'
+    if el.is_checkbox:
+        return f'<CHECKBOX data-agent-id="{el.id}" label="{label}"></CHECKBOX>'
+    tag = el.tag.upper()
+    return f'<{tag} data-agent-id="{el.id}">{label}</{tag}>'
+
+
 def get_simplified_dom(page: Page) -> str:
+    """
+    Returns only the simplified DOM string of get_dom_snapshot().
+    """
+    return get_dom_snapshot(page).dom
+
+
+def get_dom_snapshot(page: Page) -> DomSnapshot:
     """
     (Observe)
     This version adds a check for [role="menu"].
@@ -17,6 +74,10 @@ def get_simplified_dom(page: Page) -> str:
     3. If neither, use the whole document.
     This prevents the agent from clicking the '...' button *through* the
     menu it just opened.
+
+    Besides the DOM string, the snapshot carries a typed element table
+    (tag, input type, role, box) so the act phase can validate an action
+    without another browser round-trip.
     """
 
     js_script = """
@@ -31,6 +92,7 @@ def get_simplified_dom(page: Page) -> str:
         
         // --- [THE FIX IS HERE] ---
         let searchContext = document; // Default to the whole page
+        let contextKind = 'page';
 
         // 1. Check for Modals (Priority 1)
         const allDialogs = document.querySelectorAll('[role="dialog"][aria-modal="true"]');
@@ -49,6 +111,7 @@ def get_simplified_dom(page: Page) -> str:
             } else {
                 searchContext = allDialogs[0];
             }
+            contextKind = 'modal';
         } 
         // 2. Check for Menus (Priority 2)
         else { 
@@ -58,9 +121,19 @@ def get_simplified_dom(page: Page) -> str:
             if (allMenus.length > 0) {
                 // Use the first active menu found
                 searchContext = allMenus[0]; 
+                contextKind = 'menu';
             }
         }
         // --- [END OF FIX] ---
+
+        let contextLabel = '';
+        if (searchContext !== document) {
+            contextLabel = (
+                searchContext.getAttribute('aria-label') ||
+                (searchContext.querySelector('h1, h2, h3, [role="heading"]') || {}).innerText ||
+                ''
+            ).replace(/\\s+/g, ' ').trim().substring(0, 60);
+        }
         
 
         // 3. Tagging: Find elements *within the smart searchContext*
@@ -123,41 +196,56 @@ def get_simplified_dom(page: Page) -> str:
             
             const uniqueId = 'agent-id-' + (agentId++).toString();
             el.setAttribute('data-agent-id', uniqueId);
+            const rect = el.getBoundingClientRect();
 
             simplifiedDom.push({
                 tag: tagName,
                 id: uniqueId,
                 text: text,
                 inputType: inputType,
+                role: el.getAttribute('role'),
                 isTextInput: isTextInput,
-                isCheckbox: isCheckbox
+                isCheckbox: isCheckbox,
+                box: [
+                    Math.round(rect.x), Math.round(rect.y),
+                    Math.round(rect.width), Math.round(rect.height)
+                ]
             });
         }
         
-        // 6. Formatting: Return a clean list for the LLM
-        return simplifiedDom.map(el => {
-            if (el.isTextInput) {
-                const label = el.text || '';
-                return '<TEXT-INPUT data-agent-id="' + el.id +
-                       '" label="' + label + '"></TEXT-INPUT>';
-            } else if (el.isCheckbox) {
-                const label = el.text || '';
-                return '<CHECKBOX data-agent-id="' + el.id +
-                       '" label="' + label + '"></CHECKBOX>';
-            } else {
-                const label = el.text || '';
-                return '<' + el.tag.toUpperCase() +
-                       ' data-agent-id="' + el.id + '">' +
-                       label +
-                       '</' + el.tag.toUpperCase() + '>';
-            }
-        }).join('\\n');
+        // 6. Return the element table; Python formats it for the LLM
+        return {
+            kind: contextKind,
+            context: contextLabel ? contextKind + ' "' + contextLabel + '"' : contextKind,
+            elements: simplifiedDom
+        };
     }
     """
 
     try:
-        simplified_dom_string = page.evaluate(js_script)
-        return simplified_dom_string
+        result = page.evaluate(js_script)
     except Exception as e:
         print(f"Error injecting JS to simplify DOM: {e}")
-        return ""
+        return DomSnapshot()
+
+    elements = {}
+    for position, raw in enumerate(result["elements"]):
+        elements[raw["id"]] = ElementInfo(
+            id=raw["id"],
+            tag=raw["tag"],
+            text=raw["text"],
+            input_type=raw["inputType"],
+            role=raw["role"],
+            is_text_input=raw["isTextInput"],
+            is_checkbox=raw["isCheckbox"],
+            box=tuple(raw["box"]),
+            context=result["kind"],
+            position=position,
+        )
+
+    return DomSnapshot(
+        dom="\n".join(format_element(el) for el in elements.values()),
+        elements=elements,
+        context=result["context"],
+    )
+
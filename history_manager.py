@@ -0,0 +1,210 @@
+# history_manager.py
+"""
+History Management Module
+Keeps the action history passed to the think phase bounded in size,
+so the prompt stays roughly constant on long-horizon runs
+"""
+
+import re
+
+
+# Ordinal words used to split goals like "First, ... Second, ..." into sub-steps.
+# They only count as separators at the start of a sentence or clause.
+ORDINALS = (
+    "first", "second", "third", "fourth", "fifth", "sixth", "seventh",
+    "eighth", "ninth", "tenth", "then", "after that", "finally",
+)
+
+# How many goal sub-steps past the last completed one an action may complete
+GOAL_LOOKAHEAD = 2
+
+# Matches a quoted target inside a goal sub-step, e.g. 'Create issue'.
+# Quotes must not touch a word character, so apostrophes ("don't") are ignored.
+QUOTED_TEXT = re.compile(r"(?<!\w)'([^']+)'(?!\w)|\"([^\"]+)\"")
+
+ORDINAL_SEPARATOR = re.compile(
+    r"(?i)(?:^|(?<=[.;!?\u3002]))\s*(?:" + "|".join(ORDINALS) + r")\b\s*,?"
+)
+SENTENCE_SEPARATOR = re.compile(r"(?<=[.;!?\u3002])\s+")
+PLACEHOLDER = re.compile("\x00(\\d+)\x00")
+
+# How many distinct earlier actions the summary of older steps lists
+MAX_SUMMARY_ACTIONS = 20
+
+
+def split_goal(goal: str) -> list:
+    """
+    Splits a multi-step goal into its sub-steps.
+    Falls back to sentence boundaries when the goal does not use ordinals.
+    Quoted text is protected, so an ordinal or a period inside quotes
+    (e.g. 'My First AI Issue') never splits a sub-step.
+    """
+    quoted = []
+
+    def protect(match):
+        quoted.append(match.group(0))
+        return f"\x00{len(quoted) - 1}\x00"
+
+    def restore(part: str) -> str:
+        return PLACEHOLDER.sub(lambda m: quoted[int(m.group(1))], part)
+
+    protected = QUOTED_TEXT.sub(protect, goal)
+    parts = ORDINAL_SEPARATOR.split(protected)
+    if len([p for p in parts if p.strip(" .,;\u3002")]) <= 1:
+        parts = SENTENCE_SEPARATOR.split(protected)
+
+    parts = [restore(p.strip(" .,;\u3002")) for p in parts]
+    return [p for p in parts if p]
+
+
+class HistoryManager:
+    """
+    Records every step of a run and renders a bounded history for think().
+
+    The most recent `recent_window` steps are rendered verbatim, together
+    with the URL and modal context they happened in. Older steps are folded
+    into a summary of the goal sub-steps they completed, plus a compact list
+    of the distinct actions taken (with counts), so the rendered history does
+    not grow with the number of steps.
+    """
+
+    def __init__(self, goal: str, recent_window: int = 5):
+        self.goal_steps = split_goal(goal)
+        self.recent_window = recent_window
+        self.entries = []
+        # Maps goal sub-step index -> step number that completed it
+        self.completed = {}
+
+    def record(
+        self,
+        step: int,
+        action: dict,
+        label: str = "",
+        url: str = "",
+        context: str = "",
+    ):
+        """
+        Records one executed action.
+        `label` is the visible text of the target element, `url` the page URL
+        and `context` the modal or menu the element was found in.
+        """
+        action_type = action.get("action")
+        if action_type == "type":
+            description = f"Typed '{action.get('text')}' into {action.get('id')}"
+        elif action_type == "click":
+            description = f"Clicked {action.get('id')}"
+        else:
+            return
+
+        if label:
+            description += f" ('{label}')"
+
+        target = f"'{label}'" if label else action.get("id")
+        if action_type == "type":
+            summary = f"typed '{action.get('text')}' into {target}"
+        else:
+            summary = f"clicked {target}"
+
+        self.entries.append({
+            "step": step,
+            "description": description,
+            "summary": summary,
+            "url": url,
+            "context": context,
+        })
+        self._mark_completed(step, action, label)
+
+    def record_note(self, step: int, note: str, url: str = "", context: str = ""):
+        """
+        Records a step that did not execute an action, e.g. a stale target
+        that has to be re-planned.
+        """
+        self.entries.append({
+            "step": step,
+            "description": note,
+            "url": url,
+            "context": context,
+        })
+
+    def _mark_completed(self, step: int, action: dict, label: str):
+        """
+        Marks the next goal sub-step whose quoted targets match the label
+        or typed text of this action. Only the few sub-steps after the last
+        completed one are considered, so a later sub-step that mentions the
+        same button cannot be ticked off early.
+        """
+        candidates = {label.lower()}
+        if action.get("action") == "type":
+            candidates.add((action.get("text") or "").lower())
+        candidates.discard("")
+        if not candidates:
+            return
+
+        start = max(self.completed) + 1 if self.completed else 0
+        for index in range(start, min(start + GOAL_LOOKAHEAD, len(self.goal_steps))):
+            sub_step = self.goal_steps[index]
+            quoted = [a or b for a, b in QUOTED_TEXT.findall(sub_step)]
+            if any(q.lower() in candidates for q in quoted):
+                self.completed[index] = step
+                return
+
+    def render(self) -> list:
+        """
+        Returns the history as a list of lines for think().
+        """
+        lines = []
+        older = self.entries[:-self.recent_window] if self.recent_window else self.entries
+        recent = self.entries[len(older):]
+
+        if self.completed:
+            lines.append("Completed goal sub-steps:")
+            for index in sorted(self.completed):
+                lines.append(
+                    f"- [{index + 1}] {self.goal_steps[index]} "
+                    f"(done at step {self.completed[index]})"
+                )
+
+        if older:
+            lines.append(
+                f"Earlier actions (steps {older[0]['step']}-{older[-1]['step']}, "
+                f"last in {older[-1]['context'] or 'page'} @ "
+                f"{older[-1]['url'] or 'unknown URL'}):"
+            )
+            lines.extend(self._summarize(older))
+
+        for entry in recent:
+            line = f"Step {entry['step']}: {entry['description']}"
+            where = [w for w in (entry["context"], entry["url"]) if w]
+            if where:
+                line += f" [{' @ '.join(where)}]"
+            lines.append(line)
+
+        return lines
+
+    def _summarize(self, entries: list) -> list:
+        """
+        Folds entries into one line per distinct action, with its count and
+        the last step it happened at. Only the MAX_SUMMARY_ACTIONS most
+        recent distinct actions are kept, in chronological order.
+        """
+        seen = {}
+        for entry in entries:
+            summary = entry.get("summary")
+            if not summary:
+                continue
+            count, _ = seen.pop(summary, (0, 0))
+            # Re-inserting keeps the dict ordered by last occurrence
+            seen[summary] = (count + 1, entry["step"])
+
+        recent = list(seen.items())[-MAX_SUMMARY_ACTIONS:]
+        omitted = len(seen) - len(recent)
+        lines = []
+        if omitted:
+            lines.append(f"- ({omitted} other distinct actions omitted)")
+        for summary, (count, last_step) in recent:
+            times = f" x{count}" if count > 1 else ""
+            lines.append(f"- {summary}{times} (last at step {last_step})")
+        return lines
+
+    def __len__(self):
+        return len(self.entries)
@@ -1,40 +1,28 @@
 # login_linear.py
 # A separate script to perform manual login for Linear
 # and save the session state for our agent.
-# This version waits for the user to press ENTER, which is reliable.
+# The session is saved as soon as the site's anchor selector appears,
+# so there is no fixed wait and no need to come back and press ENTER.
 
-import time
+import argparse
 from playwright.sync_api import sync_playwright
 
-# Define the path for our new Linear auth file
-LINEAR_AUTH_FILE = "linear_auth.json"
+from browser_session import capture_login
+from config import SITE_CONFIGS
 
-def main():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
 
-        # Go to the Linear login page
-        page.goto("https://linear.app/login")
+def main():
+    parser = argparse.ArgumentParser(description="Log in to Linear and save the session.")
+    parser.add_argument(
+        "--persistent-profile",
+        action="store_true",
+        help="Log in inside the persistent Linear profile used by "
+             "'agent.py --persistent-profile'.",
+    )
+    args = parser.parse_args()
 
-        print("\n" + "="*50)
-        print("  Please log in to Linear manually in the browser.")
-        print("  (This may involve Google, email, etc.)")
-        print("\n  After login, please navigate to the exact workspace")
-        print("  or team page our agent should work on.")
-        print("\n  *** WHEN YOU ARE ON THE CORRECT LINEAR PAGE ***")
-        print("  *** COME BACK HERE AND PRESS 'ENTER' TO SAVE ***")
-        print("="*50)
-        
-        # Wait for user input (Enter key) instead of a timer
-        input() 
-        
-        # After user presses Enter, save the storage state
-        context.storage_state(path=LINEAR_AUTH_FILE)
-        print(f"Successfully saved Linear auth state to: {LINEAR_AUTH_FILE}")
-        
-        browser.close()
+    with sync_playwright() as p:
+        capture_login(p, SITE_CONFIGS["linear"], persistent=args.persistent_profile)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
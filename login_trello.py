@@ -1,36 +1,28 @@
 # login_trello.py
 # A separate script to perform manual login for Trello
 # and save the session state for our agent.
+# The session is saved as soon as the site's anchor selector appears,
+# so there is no fixed wait and no need to come back and press ENTER.
 
-import time
+import argparse
 from playwright.sync_api import sync_playwright
 
-# Define the path for our new Trello auth file
-TRELLO_AUTH_FILE = "trello_auth.json"
+from browser_session import capture_login
+from config import SITE_CONFIGS
 
-def main():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-
-        page.goto("https://trello.com/login")
 
-        print("\n" + "="*50)
-        print("  Please log in to Trello manually in the browser.")
-        print("  After successful login, this script will save")
-        print("  the session state.")
-        print("  We will wait for 60 seconds.")
-        print("="*50)
-
-        # Provide 60 seconds for manual login
-        page.wait_for_timeout(60000)
+def main():
+    parser = argparse.ArgumentParser(description="Log in to Trello and save the session.")
+    parser.add_argument(
+        "--persistent-profile",
+        action="store_true",
+        help="Log in inside the persistent Trello profile used by "
+             "'agent.py --persistent-profile'.",
+    )
+    args = parser.parse_args()
 
-        # After login, save the storage state
-        context.storage_state(path=TRELLO_AUTH_FILE)
-        print(f"Successfully saved Trello auth state to: {TRELLO_AUTH_FILE}")
-        
-        browser.close()
+    with sync_playwright() as p:
+        capture_login(p, SITE_CONFIGS["trello"], persistent=args.persistent_profile)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,216 @@
+# tracing.py
+"""
+Tracing Module
+Structured timing spans around the hot path (observe, think, act,
+screenshot, navigation), with JSONL and Chrome trace-event export
+and an aggregated end-of-run profile table
+"""
+
+import json
+import os
+import threading
+import time
+
+
+# Span attributes that are measurements and get summed in the profile.
+# Everything else (step numbers, ids, names...) is an identifier.
+MEASUREMENT_KEYS = (
+    "dom_bytes",
+    "elements",
+    "prompt_chars",
+    "prompt_tokens",
+    "completion_tokens",
+    "bytes_written",
+)
+
+
+class _NullSpan:
+    """
+    Span returned while tracing is disabled. Every method is a no-op,
+    and a single shared instance is reused so disabled tracing allocates
+    nothing per call.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    One timed region. Use as a context manager; attach measurements
+    (DOM size, token counts, bytes written...) with set().
+    """
+
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.depth = 0
+
+    def __enter__(self):
+        self.depth = self.tracer._push()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._pop(self)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin_ns: int) -> dict:
+        return {
+            "name": self.name,
+            "start_ms": (self.start_ns - origin_ns) / 1e6,
+            "duration_ms": self.duration_ns / 1e6,
+            "depth": self.depth,
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """
+    Collects finished spans. Disabled by default; span() then returns
+    NULL_SPAN and nothing is recorded.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.spans = []
+        self.origin_ns = time.perf_counter_ns()
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+        self.spans = []
+        self.origin_ns = time.perf_counter_ns()
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attrs)
+
+    def _push(self) -> int:
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        return depth
+
+    def _pop(self, span: Span):
+        self._local.depth = span.depth
+        self.spans.append(span)
+
+    def export_jsonl(self, path: str):
+        """
+        Writes one JSON object per span, in completion order.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for s in self.spans:
+                f.write(json.dumps(s.to_dict(self.origin_ns)) + "\n")
+
+    def export_chrome_trace(self, path: str):
+        """
+        Writes the spans as complete ("X") events in the Chrome trace-event
+        format, viewable in chrome://tracing or ui.perfetto.dev.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": (s.start_ns - self.origin_ns) / 1e3,
+                "dur": s.duration_ns / 1e3,
+                "pid": pid,
+                "tid": 0,
+                "args": s.attrs,
+            }
+            for s in sorted(self.spans, key=lambda s: s.start_ns)
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def profile(self) -> list:
+        """
+        Aggregates spans by name into rows of count, total, mean, p50, p95
+        and max duration (ms), plus the sum of each MEASUREMENT_KEYS attribute.
+        """
+        groups = {}
+        for s in self.spans:
+            groups.setdefault(s.name, []).append(s)
+
+        rows = []
+        for name, spans in groups.items():
+            durations = sorted(s.duration_ns / 1e6 for s in spans)
+            totals = {}
+            for s in spans:
+                for key in MEASUREMENT_KEYS:
+                    if key in s.attrs:
+                        totals[key] = totals.get(key, 0) + s.attrs[key]
+            rows.append({
+                "name": name,
+                "count": len(durations),
+                "total_ms": sum(durations),
+                "mean_ms": sum(durations) / len(durations),
+                "p50_ms": _percentile(durations, 50),
+                "p95_ms": _percentile(durations, 95),
+                "max_ms": durations[-1],
+                "attrs": totals,
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def format_profile(self) -> str:
+        """
+        Renders profile() as a plain-text table.
+        """
+        rows = self.profile()
+        if not rows:
+            return "No spans recorded."
+
+        header = f"{'span':<14}{'count':>7}{'total ms':>12}{'mean ms':>10}" \
+                 f"{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  totals"
+        lines = [header, "-" * len(header)]
+        for r in rows:
+            totals = ", ".join(f"{k}={v:g}" for k, v in sorted(r["attrs"].items()))
+            lines.append(
+                f"{r['name']:<14}{r['count']:>7}{r['total_ms']:>12.1f}"
+                f"{r['mean_ms']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+                f"{r['max_ms']:>10.1f}  {totals}"
+            )
+        return "\n".join(lines)
+
+
+def _percentile(sorted_values: list, percent: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[int(index)]
+
+
+# Process-wide tracer shared by all modules
+tracer = Tracer()
+
+
+def span(name: str, **attrs):
+    """
+    Shortcut for tracer.span(). Returns NULL_SPAN when tracing is off.
+    """
+    return tracer.span(name, **attrs)
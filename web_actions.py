@@ -5,51 +5,198 @@ Responsible for executing specific actions on the webpage
 """
 
 import os
+import time
+from typing import Optional
+
 from playwright.sync_api import Page
 
+from dom_processor import ElementInfo, get_dom_snapshot
+from tracing import span, tracer
+
+
+# Timeout of the first click/fill on a target from the element table. A
+# target that went stale (re-rendered without its data-agent-id) fails fast
+# and is re-resolved, instead of waiting out Playwright's 30 s default.
+FIRST_ATTEMPT_TIMEOUT_MS = 300
+
+# Timeout for the retry after a failed first attempt, and for actions
+# without an element table
+ACTION_TIMEOUT_MS = 5000
+
+
+class StaleTargetError(Exception):
+    """
+    Raised by act() when the target element disappeared after the observe
+    step and could not be re-resolved from its fingerprint. The caller
+    should observe and think again instead of stopping the run.
+    """
+
+
+def resolve_target(page: Page, target: ElementInfo) -> Optional[ElementInfo]:
+    """
+    Re-tags the DOM and finds the element matching the recorded fingerprint
+    of `target`: same tag, label and container kind, closest in position
+    and then on screen. Returns None if nothing matches.
+    """
+    snapshot = get_dom_snapshot(page)
+    candidates = [
+        el for el in snapshot.elements.values()
+        if el.tag == target.tag
+        and el.text == target.text
+        and el.context == target.context
+    ]
+    if not candidates:
+        return None
+
+    def distance(el: ElementInfo):
+        dx = el.box[0] - target.box[0]
+        dy = el.box[1] - target.box[1]
+        return (abs(el.position - target.position), dx * dx + dy * dy)
+
+    return min(candidates, key=distance)
 
-def act(page: Page, action: dict, task_dir: str, step: int) -> bool:
+
+def take_screenshot(page: Page, path: str):
+    """
+    Saves a screenshot, recording its duration and size in a trace span.
+    """
+    with span("screenshot", file=os.path.basename(path)) as s:
+        page.screenshot(path=path)
+        if tracer.enabled:
+            s.set(bytes_written=os.path.getsize(path))
+
+
+def _perform(
+    page: Page,
+    action_type: str,
+    element_id: str,
+    text: str = None,
+    timeout: float = ACTION_TIMEOUT_MS,
+):
+    """
+    Performs a click or fill on the tagged element as a single Playwright call.
+    """
+    locator = page.locator(f'[data-agent-id="{element_id}"]')
+    if action_type == "click":
+        locator.click(timeout=timeout)
+    else:
+        locator.fill(text, timeout=timeout)
+
+
+def _recover(page: Page, target: ElementInfo) -> ElementInfo:
+    """
+    Re-resolves a stale target, raising StaleTargetError if it is gone.
+    """
+    recovery_started = time.perf_counter()
+    with span("recover", target=target.id) as s:
+        resolved = resolve_target(page, target)
+        s.set(resolved=resolved is not None)
+    elapsed_ms = (time.perf_counter() - recovery_started) * 1000
+    if resolved is None:
+        raise StaleTargetError(
+            f"Target {target.id} ({target.tag} '{target.text}') is no longer "
+            f"in the {target.context}"
+        )
+    print(
+        f"Stale target {target.id} re-resolved to {resolved.id} "
+        f"in {elapsed_ms:.1f} ms"
+    )
+    return resolved
+
+
+def act(
+    page: Page,
+    action: dict,
+    task_dir: str,
+    step: int,
+    elements: dict = None,
+    settle_ms: int = 2000,
+) -> bool:
     """
     Act phase.
     Executes the chosen action inside the browser and captures
     before/after screenshots.
 
+    `elements` is the element table from get_dom_snapshot(). When given,
+    the target is validated against it without a browser round-trip and
+    the action itself is a single Playwright call with a short timeout.
+    If that call fails and the data-agent-id is still in the page, the
+    target was only not actionable yet and the action is retried once on
+    the same id with the full timeout. If the id is gone (the page
+    re-rendered the target), the target is re-resolved from its
+    fingerprint and the action retried once; if the target cannot be
+    re-resolved, StaleTargetError is raised.
+    `settle_ms` is how long to let UI animations settle before the
+    after-screenshot.
+
     Returns:
         True  -> continue the loop
         False -> stop the loop
     """
 
     before_screenshot_path = os.path.join(task_dir, f"step_{step:02d}_before.png")
-    page.screenshot(path=before_screenshot_path)
+    take_screenshot(page, before_screenshot_path)
 
     action_type = action.get("action")
+    element_id = action.get("id")
+    started = time.perf_counter()
 
     try:
-        if action_type == "click":
-            element_id = action.get("id")
-            selector = f'[data-agent-id="{element_id}"]'
-            print(f"Executing: click on element {element_id}")
-            page.locator(selector).click()
-
-        elif action_type == "type":
-            element_id = action.get("id")
-            text_to_type = action.get("text")
-            selector = f'[data-agent-id="{element_id}"]'
-            locator = page.locator(selector)
-
-            # Safety check: avoid typing into checkbox elements
-            tag = locator.evaluate("el => el.tagName.toLowerCase()")
-            input_type = locator.evaluate("el => el.getAttribute('type')")
-
-            if tag == "input" and input_type == "checkbox":
+        if action_type in ("click", "type"):
+            target = None
+            with span("validate", table=elements is not None):
+                if elements is not None:
+                    target = elements.get(element_id)
+                    if target is None:
+                        print(f"Element {element_id} is not in the observed DOM")
+                        take_screenshot(
+                            page, os.path.join(task_dir, f"step_{step:02d}_action_error.png")
+                        )
+                        return False
+
+                # Safety check: avoid typing into checkbox elements
+                is_checkbox = False
+                if action_type == "type":
+                    if target is not None:
+                        is_checkbox = target.is_checkbox
+                    else:
+                        tag, input_type = page.locator(
+                            f'[data-agent-id="{element_id}"]'
+                        ).evaluate("el => [el.tagName.toLowerCase(), el.getAttribute('type')]")
+                        is_checkbox = tag == "input" and input_type == "checkbox"
+
+            if is_checkbox:
                 print(f"Refusing to type into checkbox element {element_id}")
-                page.screenshot(
-                    path=os.path.join(task_dir, f"step_{step:02d}_type_checkbox_error.png")
+                take_screenshot(
+                    page, os.path.join(task_dir, f"step_{step:02d}_type_checkbox_error.png")
                 )
                 return False
 
-            print(f"Executing: type '{text_to_type}' into element {element_id}")
-            locator.fill(text_to_type)
+            if action_type == "click":
+                print(f"Executing: click on element {element_id}")
+            else:
+                print(f"Executing: type '{action.get('text')}' into element {element_id}")
+
+            validated = time.perf_counter()
+            with span("action", action=action_type):
+                if target is None:
+                    _perform(page, action_type, element_id, action.get("text"))
+                else:
+                    try:
+                        _perform(
+                            page, action_type, element_id, action.get("text"),
+                            timeout=FIRST_ATTEMPT_TIMEOUT_MS,
+                        )
+                    except Exception as e:
+                        if page.locator(f'[data-agent-id="{element_id}"]').count() > 0:
+                            # Still tagged, just not actionable yet (animating, covered...)
+                            print(f"Action on {element_id} failed ({e}); retrying")
+                        else:
+                            # The target was re-rendered since the observe step
+                            print(f"Action on {element_id} failed ({e}); re-resolving target")
+                            target = _recover(page, target)
+                            element_id = target.id
+                        _perform(page, action_type, element_id, action.get("text"))
 
         elif action_type == "finish":
             print(f"Task finished. Reason: {action.get('reason')}")
@@ -63,17 +210,30 @@ def act(page: Page, action: dict, task_dir: str, step: int) -> bool:
             print(f"Unknown action type: {action_type}")
             return False
 
+    except StaleTargetError:
+        take_screenshot(
+            page, os.path.join(task_dir, f"step_{step:02d}_stale_target.png")
+        )
+        raise
+
     except Exception as e:
         print(f"Error during act phase: {e}")
-        page.screenshot(
-            path=os.path.join(task_dir, f"step_{step:02d}_action_error.png")
+        take_screenshot(
+            page, os.path.join(task_dir, f"step_{step:02d}_action_error.png")
         )
         return False
 
+    finished = time.perf_counter()
+    print(
+        f"Action latency: {(finished - started) * 1000:.1f} ms "
+        f"(validate {(validated - started) * 1000:.1f} ms, "
+        f"execute {(finished - validated) * 1000:.1f} ms)"
+    )
+
     # Allow UI animations to settle after the action
-    page.wait_for_timeout(2000)
+    page.wait_for_timeout(settle_ms)
 
     after_screenshot_path = os.path.join(task_dir, f"step_{step:02d}_after.png")
-    page.screenshot(path=after_screenshot_path)
+    take_screenshot(page, after_screenshot_path)
 
     return True